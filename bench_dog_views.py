@@ -0,0 +1,266 @@
+"""
+Memory-leak benchmark for dog reminder views.
+Simulates a long run of reminders against discord.py's real view store (no network)
+and checks that the number of live views and the memory in use stay bounded.
+
+Run with: python bench_dog_views.py [days] [guilds]
+"""
+
+import asyncio
+import gc
+import itertools
+import logging
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import weakref
+
+from discord.ui.view import ViewStore
+
+import dog_reminder
+import guild_config
+
+# Memory allowed to grow between the warm-up and the end of the run
+MAX_MEMORY_GROWTH = 256 * 1024  # bytes
+WARMUP_DAYS = 30
+# Reminder timeout used for the simulation (minutes), so unanswered reminders time out quickly
+SIM_TIMEOUT_MINUTES = 0.0001
+# View grace period used for the simulation (seconds), so the backstops run during the benchmark
+SIM_VIEW_GRACE_PERIOD = 0.005
+# How long to wait after each simulated day, long enough for timeouts and expired views
+SIM_DAY_WAIT = (SIM_TIMEOUT_MINUTES * 60 + SIM_VIEW_GRACE_PERIOD) * 2
+
+_ids = itertools.count(1)
+
+
+class FakeMessage:
+    def __init__(self, store, view=None):
+        self.id = next(_ids)
+        self.store = store
+        if view is not None:
+            store.add_view(view, self.id)
+
+    async def edit(self, view=None):
+        # Like discord.py, editing with a live view puts it (back) in the store
+        if view is not None and not view.is_finished():
+            self.store.add_view(view, self.id)
+
+
+class FakeUser:
+    def __init__(self, user_id, store):
+        self.id = user_id
+        self.name = f"user{user_id}"
+        self.store = store
+        self.messages = {}
+        self.fail_next_send = False
+
+    async def send(self, content=None, view=None):
+        if self.fail_next_send:
+            self.fail_next_send = False
+            raise RuntimeError("Cannot send messages to this user")
+        message = FakeMessage(self.store, view)
+        if view is not None:
+            self.messages[message.id] = message
+        return message
+
+    async def fetch_message(self, message_id):
+        # Only reminder messages are kept, so owner alerts don't pile up here
+        return self.messages.pop(message_id)
+
+
+class FakeGuild:
+    def __init__(self, guild_id):
+        self.id = guild_id
+
+
+class FakeBot:
+    def __init__(self, store, guilds):
+        self.loop = asyncio.get_running_loop()
+        self.store = store
+        self.guilds = guilds
+        self.users = {}
+
+    async def fetch_user(self, user_id):
+        if user_id not in self.users:
+            self.users[user_id] = FakeUser(user_id, self.store)
+        return self.users[user_id]
+
+
+class FakeResponse:
+    async def send_message(self, content, ephemeral=False):
+        pass
+
+
+class FakeInteraction:
+    def __init__(self, user, message):
+        self.user = user
+        self.message = message
+        self.response = FakeResponse()
+
+
+def live_view_count(store):
+    """Views discord.py would still be holding on to"""
+    return len(store._synced_message_views)
+
+
+async def simulate_day(reminder, bot, config, guilds, outcomes, stats):
+    """Send one day's reminders in every guild and resolve each one"""
+    tasks = []
+    for guild in guilds:
+        recipient = await bot.fetch_user(config.get(guild.id, "dog_reminder_user_id"))
+        for time_of_day in ("morning", "noon", "evening"):
+            outcome = next(outcomes)
+            if outcome == "failed":
+                recipient.fail_next_send = True
+            await reminder.send_dog_reminder(time_of_day, guild.id)
+            if outcome in ("yes", "no"):
+                pending = [r for r in reminder.pending_reminders.values()
+                           if r["guild_id"] == guild.id and r["time_of_day"] == time_of_day]
+                if pending:
+                    view = pending[0]["view"]
+                    message = recipient.messages.pop(pending[0]["message_id"])
+                    button = view.yes_button if outcome == "yes" else view.no_button
+                    tasks.append(button.callback(FakeInteraction(recipient, message)))
+            elif outcome in ("lost", "stale"):
+                # The timeout check never runs, so only the backstops can clean up
+                pending = [r for r in reminder.pending_reminders.values()
+                           if r["guild_id"] == guild.id and r["time_of_day"] == time_of_day]
+                if pending:
+                    stats[outcome] += 1
+                    pending[0]["view"].lost = True
+                    pending[0]["timeout_task"].cancel()
+                    recipient.messages.pop(pending[0]["message_id"])
+                    if outcome == "stale":
+                        # The view's own timeout is lost too, leaving cleanup_stale_views()
+                        pending[0]["view"].timeout = None
+    # All of today's reminders are in flight now, before clicks, timeouts and sweeps
+    stats["peak_live"] = max(stats["peak_live"], live_view_count(bot.store))
+    await asyncio.gather(*tasks)
+    # Give unanswered reminders time to time out and lost ones time to expire
+    await asyncio.sleep(SIM_DAY_WAIT)
+    # Same sweep the reminder loop does every minute
+    stats["swept"] += reminder.cleanup_stale_views()
+
+
+async def run(days, guild_count):
+    store = ViewStore(None)
+    guilds = [FakeGuild(1000 + i) for i in range(guild_count)]
+    bot = FakeBot(store, guilds)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config = guild_config.GuildConfig(os.path.join(tmp, "bench_config.db"))
+        for guild in guilds:
+            config.set(guild.id, "dog_reminder_user_id", guild.id * 10)
+            config.set(guild.id, "dog_owner_id", guild.id * 10 + 1)
+            # Skip parse() so the simulated timeout can be shorter than a minute
+            config.set(guild.id, "reminder_timeout_minutes", SIM_TIMEOUT_MINUTES)
+        config.flush()
+
+        reminder = dog_reminder.DogReminder(bot, config)
+        created_views = weakref.WeakSet()
+        original_view = reminder.DogReminderView
+
+        stats = {"lost": 0, "stale": 0, "swept": 0, "view_timeouts": 0, "peak_live": 0}
+
+        class TrackedView(original_view):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                self.lost = False
+                created_views.add(self)
+
+            async def on_timeout(self):
+                await super().on_timeout()
+                # Only count reminders whose timeout check was lost; a normal
+                # timeout can also lose the race to the view timer
+                if self.lost and not any(r["view"] is self for r in reminder.pending_reminders.values()):
+                    stats["view_timeouts"] += 1
+
+        reminder.DogReminderView = TrackedView
+        outcomes = itertools.cycle(["yes", "no", "timeout", "failed", "lost", "stale", "yes", "timeout"])
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        baseline = None
+        for day in range(days):
+            await simulate_day(reminder, bot, config, guilds, outcomes, stats)
+            if day + 1 == WARMUP_DAYS:
+                gc.collect()
+                baseline = tracemalloc.get_traced_memory()[0]
+        elapsed = time.perf_counter() - start
+
+        gc.collect()
+        final = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        if baseline is None:
+            baseline = final
+        config.close()
+
+    result = {
+        "reminders": days * guild_count * 3,
+        "elapsed": elapsed,
+        "pending": len(reminder.pending_reminders),
+        "live_views": live_view_count(store),
+        "peak_live_views": stats["peak_live"],
+        "alive_view_objects": len(created_views),
+        "memory_growth": final - baseline,
+        **stats,
+    }
+    return result
+
+
+def main():
+    days = int(sys.argv[1]) if len(sys.argv) > 1 else 365
+    guild_count = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    # Keep the reminder module quiet, it logs every step at DEBUG level
+    logging.getLogger('dog_reminder').setLevel(logging.CRITICAL)
+    logging.getLogger('guild_config').setLevel(logging.CRITICAL)
+
+    grace_period = dog_reminder.VIEW_GRACE_PERIOD
+    dog_reminder.VIEW_GRACE_PERIOD = SIM_VIEW_GRACE_PERIOD
+    with open(os.devnull, "w") as devnull:
+        stdout, sys.stdout = sys.stdout, devnull
+        try:
+            result = asyncio.run(run(days, guild_count))
+        finally:
+            sys.stdout = stdout
+            dog_reminder.VIEW_GRACE_PERIOD = grace_period
+
+    print(f"Simulated {result['reminders']} reminders over {days} days in {guild_count} guilds "
+          f"({result['elapsed']:.2f}s)")
+    print(f"Pending reminders at end: {result['pending']}")
+    print(f"Views in discord.py's store at end: {result['live_views']} (peak {result['peak_live_views']})")
+    print(f"View objects still alive: {result['alive_view_objects']}")
+    print(f"Lost timeout checks cleaned up by the view timeout: {result['view_timeouts']}/{result['lost']}")
+    print(f"Lost views cleaned up by cleanup_stale_views(): {result['swept']}/{result['stale']}")
+    print(f"Memory growth after warm-up: {result['memory_growth'] / 1024:.1f} KiB")
+
+    # At most one day's reminders can be in flight at once
+    max_live = guild_count * 3
+    failures = []
+    if result["pending"] != 0:
+        failures.append("reminders were left pending")
+    if result["live_views"] != 0:
+        failures.append("views were left in discord.py's view store")
+    if result["peak_live_views"] > max_live:
+        failures.append(f"more than one day's views ({max_live}) were in the view store at once")
+    if days and result["peak_live_views"] == 0:
+        failures.append("no views were ever seen in the view store, the peak check measured nothing")
+    if result["view_timeouts"] != result["lost"]:
+        failures.append("the view timeout did not release reminders whose timeout check was lost")
+    if result["swept"] != result["stale"]:
+        failures.append("cleanup_stale_views() did not release expired reminders")
+    if result["alive_view_objects"] != 0:
+        failures.append("view objects were never freed")
+    if days > WARMUP_DAYS and result["memory_growth"] > MAX_MEMORY_GROWTH:
+        failures.append(f"memory grew by more than {MAX_MEMORY_GROWTH // 1024} KiB")
+
+    if failures:
+        print("FAIL: " + "; ".join(failures))
+        sys.exit(1)
+    print("OK: view count and memory stayed bounded")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Accuracy check for the !profile sampler.
+Runs an event loop that is busy for a known share of the time in short callbacks
+and checks that the profiler reports about the same share as not idle.
+
+Run with: python bench_profiler.py [seconds per case]
+"""
+
+import asyncio
+import sys
+import time
+
+from profiler import SamplingProfiler, categorize
+
+# (busy ms per callback, idle ms between callbacks)
+CASES = [(3, 5), (1, 5), (20, 20)]
+# Allowed difference between the measured and the reported busy share
+TOLERANCE = 0.10
+
+
+def busy_handler(duration, totals):
+    """Spin the CPU for duration seconds, like a slow message handler would"""
+    start = time.perf_counter()
+    while time.perf_counter() - start < duration:
+        pass
+    totals["busy"] += time.perf_counter() - start
+
+
+async def run_case(busy_ms, idle_ms, seconds):
+    totals = {"busy": 0.0}
+    profiler = SamplingProfiler()
+    start = time.perf_counter()
+    profiler.start()
+    try:
+        while time.perf_counter() - start < seconds:
+            busy_handler(busy_ms / 1000, totals)
+            await asyncio.sleep(idle_ms / 1000)
+    finally:
+        profiler.stop()
+    actual = totals["busy"] / (time.perf_counter() - start)
+    total = sum(profiler.cpu_samples.values()) or 1
+    idle = sum(count for stack, count in profiler.cpu_samples.items() if categorize(stack) == "idle")
+    return actual, 1 - idle / total, total
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 5
+    failures = []
+    for busy_ms, idle_ms in CASES:
+        actual, reported, samples = asyncio.run(run_case(busy_ms, idle_ms, seconds))
+        print(f"{busy_ms}ms busy / {idle_ms}ms idle: actually busy {actual:.0%}, "
+              f"profiler reports {reported:.0%} not idle ({samples} samples)")
+        if abs(actual - reported) > TOLERANCE:
+            failures.append(f"{busy_ms}ms/{idle_ms}ms case off by {abs(actual - reported):.0%}")
+
+    if failures:
+        print("FAIL: " + "; ".join(failures))
+        sys.exit(1)
+    print(f"OK: reported busy share within {TOLERANCE:.0%} of the real one")
+
+
+if __name__ == "__main__":
+    main()
@@ -18,29 +18,56 @@ formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(messag
 handler.setFormatter(formatter)
 logger.addHandler(handler)
 
+# Extra time a reminder's view is kept after its timeout, in case the timeout check is late
+VIEW_GRACE_PERIOD = 5 * 60
+
 class DogReminder:
-    def __init__(self, bot):
+    def __init__(self, bot, guild_config):
         self.bot = bot
-        self.dog_reminder_user_id = 343513966049492999  # Default user ID
-        self.dog_owner_id = 143474592529252353  # Owner to notify if dog isn't taken care of
-        self.timezone = pytz.timezone('Europe/Paris')  # GMT+1 timezone (Paris)
-        self.morning_time = datetime.time(hour=8, minute=0)  # 08:00
-        self.noon_time = datetime.time(hour=13, minute=0)  # 13:00
-        self.evening_time = datetime.time(hour=20, minute=0)  # 20:00
-        self.timeout = 60 * 60  # 1 hour timeout in seconds
+        # Recipient, owner, timezone, times and timeout are per-guild settings
+        self.guild_config = guild_config
         self.pending_reminders = {}
         self._task = None
         logger.info("DogReminder initialized")
         
     async def start(self):
         """Start the dog reminder task - MUST be called from an async context"""
-        # Define the task check function in on_ready
-        self._task = self.bot.loop.create_task(self._reminder_loop())
+        # Drop views left over from before a reconnect
+        self.cleanup_stale_views()
+        # on_ready fires again after reconnects, so only start the loop once
+        if self._task is None or self._task.done():
+            self._task = self.bot.loop.create_task(self._reminder_loop())
         
     def cog_unload(self):
         """Clean up when the cog is unloaded"""
         if self._task:
             self._task.cancel()
+        for reminder_id in list(self.pending_reminders):
+            self.release_reminder(reminder_id)
+    
+    def release_reminder(self, reminder_id):
+        """Remove a pending reminder and stop its view so discord.py stops tracking it"""
+        reminder = self.pending_reminders.pop(reminder_id, None)
+        if reminder is None:
+            return None
+        reminder["view"].stop()
+        # Cancel the timeout check unless we are being called from it
+        timeout_task = reminder.get("timeout_task")
+        if timeout_task and timeout_task is not asyncio.current_task():
+            timeout_task.cancel()
+        logger.debug(f"Released reminder {reminder_id} and stopped its view")
+        return reminder
+    
+    def cleanup_stale_views(self):
+        """Release reminders whose view has expired or outlived its timeout"""
+        now = datetime.datetime.now(datetime.timezone.utc)
+        stale = [reminder_id for reminder_id, reminder in self.pending_reminders.items()
+                 if reminder["view"].is_finished() or reminder["expires_at"] <= now]
+        for reminder_id in stale:
+            self.release_reminder(reminder_id)
+        if stale:
+            logger.info(f"Cleaned up {len(stale)} stale reminder views")
+        return len(stale)
             
     async def _reminder_loop(self):
         """The main reminder loop that replaces the tasks decorator"""
@@ -50,29 +77,26 @@ class DogReminder:
         
         while not self.bot.is_closed():
             try:
-                # Get current time in the specified timezone
-                now = datetime.datetime.now(self.timezone)
-                current_hour, current_minute = now.hour, now.minute
-                
-                logger.debug(f"Current time check: {now.strftime('%Y-%m-%d %H:%M:%S')} ({self.timezone})")
-                logger.debug(f"Morning time: {self.morning_time.hour}:{self.morning_time.minute}")
-                logger.debug(f"Noon time: {self.noon_time.hour}:{self.noon_time.minute}")
-                logger.debug(f"Evening time: {self.evening_time.hour}:{self.evening_time.minute}")
-                
-                # Check for morning reminder
-                if current_hour == self.morning_time.hour and current_minute == self.morning_time.minute:
-                    logger.info(f"Triggering morning reminder at {now.strftime('%H:%M')}")
-                    await self.send_dog_reminder("morning")
-                
-                # Check for noon reminder
-                if current_hour == self.noon_time.hour and current_minute == self.noon_time.minute:
-                    logger.info(f"Triggering noon reminder at {now.strftime('%H:%M')}")
-                    await self.send_dog_reminder("noon")
-                
-                # Check for evening reminder
-                if current_hour == self.evening_time.hour and current_minute == self.evening_time.minute:
-                    logger.info(f"Triggering evening reminder at {now.strftime('%H:%M')}")
-                    await self.send_dog_reminder("evening")
+                for guild in self.bot.guilds:
+                    settings = self.guild_config.for_guild(guild.id)
+                    # Guilds without a recipient have no dog reminders
+                    if not settings["dog_reminder_user_id"]:
+                        continue
+                    
+                    # Get current time in the guild's timezone
+                    now = datetime.datetime.now(settings["timezone"])
+                    current_hour, current_minute = now.hour, now.minute
+                    logger.debug(f"Current time check for guild {guild.id}: {now.strftime('%Y-%m-%d %H:%M:%S')} ({settings['timezone']})")
+                    
+                    # Check for morning, noon and evening reminders
+                    for time_of_day in ("morning", "noon", "evening"):
+                        reminder_time = settings[f"{time_of_day}_time"]
+                        if current_hour == reminder_time.hour and current_minute == reminder_time.minute:
+                            logger.info(f"Triggering {time_of_day} reminder for guild {guild.id} at {now.strftime('%H:%M')}")
+                            await self.send_dog_reminder(time_of_day, guild.id)
+            
+                # Drop any views whose timeout check never ran
+                self.cleanup_stale_views()
             
             except Exception as e:
                 logger.error(f"Error in reminder loop: {e}", exc_info=True)
@@ -82,26 +106,41 @@ class DogReminder:
         
     # Removed tasks decorator and replaced with _reminder_loop above
     
-    async def send_dog_reminder(self, time_of_day):
-        """Send a dog reminder to the configured user"""
-        logger.info(f"Attempting to send {time_of_day} dog reminder")
+    async def fetch_owner(self, guild_id):
+        """Fetch the guild's alert recipient, or None if the guild has none configured"""
+        owner_id = self.guild_config.get(guild_id, "dog_owner_id")
+        if not owner_id:
+            logger.warning(f"No dog owner configured for guild {guild_id}, skipping alert")
+            return None
+        return await self.bot.fetch_user(owner_id)
+    
+    async def send_dog_reminder(self, time_of_day, guild_id):
+        """Send a dog reminder to the user configured for a guild"""
+        logger.info(f"Attempting to send {time_of_day} dog reminder for guild {guild_id}")
+        settings = self.guild_config.for_guild(guild_id)
+        recipient_id = settings["dog_reminder_user_id"]
+        if not recipient_id:
+            logger.warning(f"No dog reminder recipient configured for guild {guild_id}")
+            return
         try:
             # Fetch the user
             try:
-                user = await self.bot.fetch_user(self.dog_reminder_user_id)
+                user = await self.bot.fetch_user(recipient_id)
                 logger.debug(f"Successfully fetched user {user.name} (ID: {user.id})")
             except Exception as user_error:
-                logger.error(f"Failed to fetch user with ID {self.dog_reminder_user_id}: {user_error}")
+                logger.error(f"Failed to fetch user with ID {recipient_id}: {user_error}")
                 # Try to notify owner about this failure
                 try:
-                    owner = await self.bot.fetch_user(self.dog_owner_id)
-                    await owner.send(f"❌ Error: Failed to send dog reminder because user with ID {self.dog_reminder_user_id} could not be found.")
+                    owner = await self.fetch_owner(guild_id)
+                    if owner:
+                        await owner.send(f"❌ Error: Failed to send dog reminder because user with ID {recipient_id} could not be found.")
                 except Exception as owner_error:
                     logger.error(f"Also failed to notify owner: {owner_error}")
                 return
             
-            # Create yes/no buttons
-            view = self.DogReminderView(time_of_day, self)
+            # Create yes/no buttons that expire shortly after the reminder times out
+            timeout_minutes = settings["reminder_timeout_minutes"]
+            view = self.DogReminderView(time_of_day, self, timeout=timeout_minutes * 60 + VIEW_GRACE_PERIOD)
             
             # Send appropriate message with buttons
             try:
@@ -115,28 +154,36 @@ class DogReminder:
                 logger.info(f"Successfully sent {time_of_day} reminder message (ID: {message.id}) to {user.name}")
             except Exception as message_error:
                 logger.error(f"Failed to send message to user: {message_error}", exc_info=True)
+                # Nothing will ever click these buttons
+                view.stop()
                 # Try to notify owner about this failure
                 try:
-                    owner = await self.bot.fetch_user(self.dog_owner_id)
-                    await owner.send(f"❌ Error: Failed to send dog reminder to {user.name} due to: {str(message_error)}")
+                    owner = await self.fetch_owner(guild_id)
+                    if owner:
+                        await owner.send(f"❌ Error: Failed to send dog reminder to {user.name} due to: {str(message_error)}")
                 except:
                     logger.error("Also failed to notify owner about message sending failure")
                 return
                 
             # Store the reminder in pending reminders
-            now = datetime.datetime.now(self.timezone)
-            reminder_id = f"{time_of_day}_{now.strftime('%Y%m%d')}"
+            now = datetime.datetime.now(settings["timezone"])
+            reminder_id = f"{guild_id}_{time_of_day}_{now.strftime('%Y%m%d')}"
+            # A resent reminder (e.g. !testreminderdog) replaces the old one
+            self.release_reminder(reminder_id)
             self.pending_reminders[reminder_id] = {
                 "message_id": message.id,
+                "guild_id": guild_id,
                 "user_id": user.id,
                 "time_of_day": time_of_day,
                 "timestamp": now,
+                "expires_at": now + datetime.timedelta(seconds=view.timeout),
                 "view": view
             }
             logger.debug(f"Created reminder with ID: {reminder_id}")
             
             # Start timeout check task
-            self.bot.loop.create_task(self.check_reminder_timeout(reminder_id))
+            self.pending_reminders[reminder_id]["timeout_task"] = self.bot.loop.create_task(
+                self.check_reminder_timeout(reminder_id, timeout_minutes))
             logger.debug(f"Started timeout check task for reminder {reminder_id}")
                 
             print(f"Sent {time_of_day} dog reminder to user {user.name}")
@@ -144,30 +191,32 @@ class DogReminder:
             logger.error(f"Unexpected error in send_dog_reminder: {e}", exc_info=True)
             print(f"Failed to send dog reminder: {e}")
     
-    async def check_reminder_timeout(self, reminder_id):
+    async def check_reminder_timeout(self, reminder_id, timeout_minutes):
         """Check if a reminder has timed out after the configured timeout period"""
-        logger.debug(f"Starting timeout check for reminder {reminder_id}, will wait {self.timeout} seconds")
-        await asyncio.sleep(self.timeout)
+        logger.debug(f"Starting timeout check for reminder {reminder_id}, will wait {timeout_minutes * 60} seconds")
+        await asyncio.sleep(timeout_minutes * 60)
         
         # Check if the reminder is still pending
         if reminder_id in self.pending_reminders:
             logger.info(f"Reminder {reminder_id} has timed out and is still pending")
+            reminder = self.pending_reminders[reminder_id]
             try:
                 # Reminder timed out, notify the owner
                 try:
-                    owner = await self.bot.fetch_user(self.dog_owner_id)
-                    time_of_day = self.pending_reminders[reminder_id]["time_of_day"]
-                    await owner.send(f"⚠️ OVERDUE ALERT: The dog is overdue for the {time_of_day} walk and feeding! No response received within {self.timeout//60} minutes.")
-                    logger.info(f"Successfully notified owner about overdue {time_of_day} reminder")
+                    owner = await self.fetch_owner(reminder["guild_id"])
+                    time_of_day = reminder["time_of_day"]
+                    if owner:
+                        await owner.send(f"⚠️ OVERDUE ALERT: The dog is overdue for the {time_of_day} walk and feeding! No response received within {timeout_minutes} minutes.")
+                        logger.info(f"Successfully notified owner about overdue {time_of_day} reminder")
                 except Exception as owner_error:
                     logger.error(f"Failed to notify owner about timeout: {owner_error}")
                 
                 # Disable buttons on the original message if possible
                 try:
-                    user = await self.bot.fetch_user(self.pending_reminders[reminder_id]["user_id"])
-                    message = await user.fetch_message(self.pending_reminders[reminder_id]["message_id"])
+                    user = await self.bot.fetch_user(reminder["user_id"])
+                    message = await user.fetch_message(reminder["message_id"])
                     
-                    view = self.pending_reminders[reminder_id]["view"]
+                    view = reminder["view"]
                     for item in view.children:
                         item.disabled = True
                     
@@ -177,23 +226,34 @@ class DogReminder:
                     logger.error(f"Failed to disable buttons on original message: {message_error}")
                     # We continue execution despite this error
                     
-                # Remove from pending reminders
-                del self.pending_reminders[reminder_id]
-                logger.debug(f"Removed reminder {reminder_id} from pending reminders")
-                
             except Exception as e:
                 logger.error(f"Failed to process reminder timeout: {e}", exc_info=True)
                 print(f"Failed to process reminder timeout: {e}")
+            finally:
+                # Remove from pending reminders and stop the view, unless a resent
+                # reminder with the same ID has replaced this one in the meantime
+                if self.pending_reminders.get(reminder_id) is reminder:
+                    self.release_reminder(reminder_id)
+                    logger.debug(f"Removed reminder {reminder_id} from pending reminders")
         else:
             logger.debug(f"Reminder {reminder_id} was already handled or removed")
     
     # Button view for dog reminders
     class DogReminderView(discord.ui.View):
-        def __init__(self, time_of_day, reminder_instance):
-            super().__init__(timeout=None)  # No timeout on the view itself
+        def __init__(self, time_of_day, reminder_instance, timeout=None):
+            # The timeout is a backstop; normally the reminder stops the view itself
+            super().__init__(timeout=timeout)
             self.time_of_day = time_of_day
             self.reminder = reminder_instance
             self.response = None
+        
+        async def on_timeout(self):
+            """Release the reminder if the view expires before anything else cleaned it up"""
+            for reminder_id, reminder in list(self.reminder.pending_reminders.items()):
+                if reminder["view"] is self:
+                    self.reminder.release_reminder(reminder_id)
+                    logger.warning(f"View for reminder {reminder_id} expired before the reminder was resolved")
+                    break
             
         @discord.ui.button(label="Yes", style=discord.ButtonStyle.green)
         async def yes_button(self, interaction: discord.Interaction, button: discord.ui.Button):
@@ -213,7 +273,7 @@ class DogReminder:
                 reminder_removed = False
                 for reminder_id, reminder in list(self.reminder.pending_reminders.items()):
                     if reminder["message_id"] == interaction.message.id:
-                        del self.reminder.pending_reminders[reminder_id]
+                        self.reminder.release_reminder(reminder_id)
                         reminder_removed = True
                         logger.debug(f"Removed reminder {reminder_id} after 'Yes' response")
                         break
@@ -257,14 +317,17 @@ class DogReminder:
                 if reminder_id:
                     # Send notification to owner
                     try:
-                        owner = await self.reminder.bot.fetch_user(self.reminder.dog_owner_id)
-                        time_of_day = self.reminder.pending_reminders[reminder_id]['time_of_day']
-                        await owner.send(f"⚠️ Alert: The dog hasn't been taken care of for the {time_of_day} session!")
-                        logger.info(f"Successfully notified owner about unattended {time_of_day} dog session")
-                        del self.reminder.pending_reminders[reminder_id]
-                        logger.debug(f"Removed reminder {reminder_id} after 'No' response")
+                        reminder = self.reminder.pending_reminders[reminder_id]
+                        owner = await self.reminder.fetch_owner(reminder['guild_id'])
+                        time_of_day = reminder['time_of_day']
+                        if owner:
+                            await owner.send(f"⚠️ Alert: The dog hasn't been taken care of for the {time_of_day} session!")
+                            logger.info(f"Successfully notified owner about unattended {time_of_day} dog session")
                     except Exception as owner_error:
                         logger.error(f"Failed to notify owner: {owner_error}")
+                    # The user answered, so the reminder is done either way
+                    self.reminder.release_reminder(reminder_id)
+                    logger.debug(f"Removed reminder {reminder_id} after 'No' response")
                 else:
                     logger.warning(f"Could not find matching reminder for message ID {interaction.message.id}")
                         
@@ -280,9 +343,9 @@ class DogReminder:
             except Exception as e:
                 logger.error(f"Unexpected error in no_button: {e}", exc_info=True)
 
-def setup(bot):
+def setup(bot, guild_config):
     """Create and register the dog reminder commands"""
-    dog_reminder = DogReminder(bot)
+    dog_reminder = DogReminder(bot, guild_config)
     
     # Add a modified on_ready handler to start the reminders
     original_on_ready = bot.event(bot.on_ready)
@@ -299,46 +362,52 @@ def setup(bot):
         print("Dog reminder loop started from on_ready")
     
     @bot.command(name="dogtimezone")
+    @commands.guild_only()
     @commands.is_owner()  # Only the bot owner can use this command
     async def dog_timezone(ctx, timezone_name: str = None):
         """Set or check the timezone for dog reminders"""
         if timezone_name:
             try:
                 new_tz = pytz.timezone(timezone_name)
-                dog_reminder.timezone = new_tz
+                guild_config.set(ctx.guild.id, "timezone", new_tz)
                 await ctx.send(f"Timezone set to {timezone_name}")
-                logger.info(f"Changed timezone to {timezone_name}")
+                logger.info(f"Changed timezone for guild {ctx.guild.id} to {timezone_name}")
             except Exception as e:
                 await ctx.send(f"Error setting timezone: {e}")
                 logger.error(f"Error setting timezone: {e}")
         else:
-            current_time = datetime.datetime.now(dog_reminder.timezone)
-            await ctx.send(f"Current timezone: {dog_reminder.timezone}\n"
+            settings = guild_config.for_guild(ctx.guild.id)
+            current_time = datetime.datetime.now(settings["timezone"])
+            await ctx.send(f"Current timezone: {settings['timezone']}\n"
                           f"Current time: {current_time.strftime('%Y-%m-%d %H:%M:%S')}\n"
-                          f"Morning reminder: {dog_reminder.morning_time.hour}:{dog_reminder.morning_time.minute:02d}\n"
-                          f"Noon reminder: {dog_reminder.noon_time.hour}:{dog_reminder.noon_time.minute:02d}\n"
-                          f"Evening reminder: {dog_reminder.evening_time.hour}:{dog_reminder.evening_time.minute:02d}")
-            logger.info(f"Displayed current timezone settings: {dog_reminder.timezone}")
+                          f"Morning reminder: {settings['morning_time'].hour}:{settings['morning_time'].minute:02d}\n"
+                          f"Noon reminder: {settings['noon_time'].hour}:{settings['noon_time'].minute:02d}\n"
+                          f"Evening reminder: {settings['evening_time'].hour}:{settings['evening_time'].minute:02d}")
+            logger.info(f"Displayed current timezone settings: {settings['timezone']}")
     
     @bot.command(name="dogstatus")
+    @commands.guild_only()
     @commands.is_owner()  # Only the bot owner can use this command
     async def dog_status(ctx):
         """Check the current status of dog reminders"""
-        current_time = datetime.datetime.now(dog_reminder.timezone)
-        pending_count = len(dog_reminder.pending_reminders)
+        settings = guild_config.for_guild(ctx.guild.id)
+        current_time = datetime.datetime.now(settings["timezone"])
+        guild_reminders = {reminder_id: reminder for reminder_id, reminder in dog_reminder.pending_reminders.items()
+                           if reminder["guild_id"] == ctx.guild.id}
+        pending_count = len(guild_reminders)
         status_message = (
             f"🐕 Dog Reminder Status 🐕\n"
-            f"Current time: {current_time.strftime('%Y-%m-%d %H:%M:%S')} ({dog_reminder.timezone})\n"
+            f"Current time: {current_time.strftime('%Y-%m-%d %H:%M:%S')} ({settings['timezone']})\n"
             f"Active reminders: {pending_count}\n"
-            f"Reminder recipient: <@{dog_reminder.dog_reminder_user_id}>\n"
-            f"Alert recipient: <@{dog_reminder.dog_owner_id}>\n"
-            f"Timeout: {dog_reminder.timeout//60} minutes"
+            f"Reminder recipient: {guild_config.show('dog_reminder_user_id', settings['dog_reminder_user_id'])}\n"
+            f"Alert recipient: {guild_config.show('dog_owner_id', settings['dog_owner_id'])}\n"
+            f"Timeout: {settings['reminder_timeout_minutes']} minutes"
         )
         
         # Add details of pending reminders if any
         if pending_count > 0:
             status_message += "\n\nPending reminders:"
-            for reminder_id, reminder in dog_reminder.pending_reminders.items():
+            for reminder_id, reminder in guild_reminders.items():
                 time_since = (current_time - reminder["timestamp"]).total_seconds() // 60
                 status_message += f"\n- {reminder_id}: {reminder['time_of_day']} ({time_since} minutes ago)"
                 
@@ -346,36 +415,47 @@ def setup(bot):
         logger.info("Displayed dog reminder status")
     
     @bot.command(name="setdogreminder")
+    @commands.guild_only()
     @commands.is_owner()  # Only the bot owner can use this command
     async def set_dog_reminder(ctx, user_id: int = None):
         """Set which user should receive dog reminders"""
         if user_id:
             try:
                 user = await bot.fetch_user(user_id)
-                dog_reminder.dog_reminder_user_id = user_id
+                guild_config.set(ctx.guild.id, "dog_reminder_user_id", user_id)
                 await ctx.send(f"Dog reminder recipient set to {user.name}")
             except:
                 await ctx.send("Could not find a user with that ID.")
         else:
-            user = await bot.fetch_user(dog_reminder.dog_reminder_user_id)
+            recipient_id = guild_config.get(ctx.guild.id, "dog_reminder_user_id")
+            if not recipient_id:
+                await ctx.send("No dog reminder recipient is set for this server.")
+                return
+            user = await bot.fetch_user(recipient_id)
             await ctx.send(f"Current dog reminder recipient: {user.name}")
     
     @bot.command(name="setdogowner")
+    @commands.guild_only()
     @commands.is_owner()  # Only the bot owner can use this command
     async def set_dog_owner(ctx, user_id: int = None):
         """Set which user should be notified if the dog is not taken care of"""
         if user_id:
             try:
                 user = await bot.fetch_user(user_id)
-                dog_reminder.dog_owner_id = user_id
+                guild_config.set(ctx.guild.id, "dog_owner_id", user_id)
                 await ctx.send(f"Dog owner alert recipient set to {user.name}")
             except:
                 await ctx.send("Could not find a user with that ID.")
         else:
-            user = await bot.fetch_user(dog_reminder.dog_owner_id)
+            owner_id = guild_config.get(ctx.guild.id, "dog_owner_id")
+            if not owner_id:
+                await ctx.send("No dog owner alert recipient is set for this server.")
+                return
+            user = await bot.fetch_user(owner_id)
             await ctx.send(f"Current dog owner alert recipient: {user.name}")
     
     @bot.command(name="setremindertime")
+    @commands.guild_only()
     @commands.is_owner()  # Only the bot owner can use this command
     async def set_reminder_time(ctx, reminder_type: str, hour: int, minute: int = 0):
         """Set reminder times. Type can be 'morning', 'noon', or 'evening'."""
@@ -388,28 +468,26 @@ def setup(bot):
             return
         
         new_time = datetime.time(hour=hour, minute=minute)
-        
-        if reminder_type.lower() == "morning":
-            dog_reminder.morning_time = new_time
-            await ctx.send(f"Morning reminder time set to {hour:02d}:{minute:02d}")
-        elif reminder_type.lower() == "noon":
-            dog_reminder.noon_time = new_time
-            await ctx.send(f"Noon reminder time set to {hour:02d}:{minute:02d}")
-        else:
-            dog_reminder.evening_time = new_time
-            await ctx.send(f"Evening reminder time set to {hour:02d}:{minute:02d}")
+        guild_config.set(ctx.guild.id, f"{reminder_type.lower()}_time", new_time)
+        await ctx.send(f"{reminder_type.capitalize()} reminder time set to {hour:02d}:{minute:02d}")
     
     @bot.command(name="testreminderdog")
+    @commands.guild_only()
     @commands.is_owner()  # Only the bot owner can use this command
     async def test_dog_reminder(ctx, time_of_day: str = "morning"):
         """Manually trigger a dog reminder to test it"""
         if time_of_day.lower() not in ["morning", "noon", "evening"]:
             time_of_day = "morning"
+        
+        if not guild_config.get(ctx.guild.id, "dog_reminder_user_id"):
+            await ctx.send("No dog reminder recipient is set for this server. Use !setdogreminder first.")
+            return
             
-        await dog_reminder.send_dog_reminder(time_of_day)
+        await dog_reminder.send_dog_reminder(time_of_day, ctx.guild.id)
         await ctx.send(f"Test {time_of_day} reminder sent!")
     
     @bot.command(name="settimeout")
+    @commands.guild_only()
     @commands.is_owner()  # Only the bot owner can use this command
     async def set_timeout(ctx, minutes: int = 60):
         """Set how long to wait for a response before sending an alert (in minutes)"""
@@ -417,7 +495,7 @@ def setup(bot):
             await ctx.send("Timeout must be at least 1 minute.")
             return
             
-        dog_reminder.timeout = minutes * 60  # Convert minutes to seconds
+        guild_config.set(ctx.guild.id, "reminder_timeout_minutes", minutes)
         await ctx.send(f"Reminder timeout set to {minutes} minutes.")
     
-    return dog_reminder
\ No newline at end of file
+    return dog_reminder
@@ -0,0 +1,336 @@
+"""
+Guild config module for BeanBot.
+This module keeps per-guild settings in an in-memory cache backed by a local SQLite file.
+"""
+
+import discord
+from discord.ext import commands
+import asyncio
+import datetime
+import json
+import logging
+import os
+import sqlite3
+import pytz
+
+# Set up logging
+logger = logging.getLogger('guild_config')
+logger.setLevel(logging.DEBUG)
+handler = logging.FileHandler('guild_config.log')
+formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+handler.setFormatter(formatter)
+logger.addHandler(handler)
+
+# Settings used in DMs (no guild) and edited with !config from a DM
+GLOBAL_SCOPE = 0
+
+
+# Converters for each kind of setting: parse (command text -> value),
+# dump (value -> JSON for SQLite), load (JSON -> value) and show (value -> text)
+def _parse_user(text):
+    text = text.strip()
+    if text.lower() in ("none", "off"):
+        return None
+    return int(text.strip("<@!>"))
+
+def _parse_time(text):
+    hour, _, minute = text.strip().partition(":")
+    return datetime.time(hour=int(hour), minute=int(minute or 0))
+
+def _parse_minutes(text):
+    minutes = int(text)
+    if minutes < 1:
+        raise ValueError("Timeout must be at least 1 minute.")
+    return minutes
+
+def _parse_phrases(text):
+    phrases = tuple(p.strip().lower() for p in text.split(",") if p.strip())
+    if not phrases:
+        raise ValueError("Give at least one phrase (comma separated).")
+    return phrases
+
+def _parse_responses(text):
+    raise ValueError("Use !whatami set/clear to edit these responses.")
+
+_KINDS = {
+    "user": (_parse_user, lambda v: v, lambda v: v,
+             lambda v: f"<@{v}>" if v else "not set"),
+    "time": (_parse_time, lambda v: v.strftime("%H:%M"),
+             lambda v: datetime.time.fromisoformat(v), lambda v: v.strftime("%H:%M")),
+    "timezone": (lambda t: pytz.timezone(t.strip()), lambda v: v.zone,
+                 pytz.timezone, lambda v: v.zone),
+    "minutes": (_parse_minutes, lambda v: v, int, lambda v: f"{v} minutes"),
+    "phrases": (_parse_phrases, list, tuple, lambda v: ", ".join(v)),
+    "text": (lambda t: t.strip(), lambda v: v, str, lambda v: v),
+    "responses": (_parse_responses,
+                  lambda v: {str(k): r for k, r in v.items()},
+                  lambda v: {int(k): r for k, r in v.items()},
+                  lambda v: "\n".join(f"  <@{k}>: {r}" for k, r in v.items()) or "none"),
+}
+
+# Known settings: name -> (kind, default)
+SETTINGS = {
+    "dog_reminder_user_id": ("user", None),
+    "dog_owner_id": ("user", None),
+    "timezone": ("timezone", pytz.timezone('Europe/Paris')),
+    "morning_time": ("time", datetime.time(hour=8, minute=0)),
+    "noon_time": ("time", datetime.time(hour=13, minute=0)),
+    "evening_time": ("time", datetime.time(hour=20, minute=0)),
+    "reminder_timeout_minutes": ("minutes", 60),
+    "how_are_phrases": ("phrases", ("how are you", "how is", "hows it going", "how's it going", "how are")),
+    "employer_phrases": ("phrases", ("employer", "regiocom", "workplace", "coworkers")),
+    "what_am_i_default": ("text", "You are a bottom, {mention}!"),
+    "what_am_i_responses": ("responses", {
+        143474592529252353: "You are the dumbest of all nerds, {mention}!",
+        343513966049492999: "Youre a bottom cow, {mention}!",
+        287897806751006720: "Youre a bimbdeer pretending to be a smart doctor.. who is also actually a smart doctor, {mention}!",
+        690988264697364532: "Youre a lil piss baby, {mention}!",
+    }),
+}
+
+
+class GuildConfig:
+    def __init__(self, path, flush_interval=5):
+        self.path = path
+        self.flush_interval = flush_interval  # Seconds between write-behind flushes
+        self._cache = {}  # guild_id -> {setting name: value}
+        self._dirty = {}  # (guild_id, setting name) -> JSON text, or None to delete
+        self._task = None
+        self._db = sqlite3.connect(path)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS guild_config ("
+            "guild_id INTEGER NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, "
+            "PRIMARY KEY (guild_id, key))"
+        )
+        self._db.commit()
+        logger.info(f"GuildConfig initialized with database {path}")
+
+    def for_guild(self, guild_id):
+        """Return the settings dict for a guild (None means the global scope).
+
+        The dict is cached, so after the first call this is a single dict lookup.
+        Treat it as read-only and change values through set() and reset().
+        """
+        if guild_id is None:
+            guild_id = GLOBAL_SCOPE
+        settings = self._cache.get(guild_id)
+        if settings is None:
+            settings = self._load_guild(guild_id)
+        return settings
+
+    def get(self, guild_id, key):
+        """Get a single setting for a guild"""
+        return self.for_guild(guild_id)[key]
+
+    def set(self, guild_id, key, value):
+        """Change a setting in the cache and queue it to be written to disk"""
+        if guild_id is None:
+            guild_id = GLOBAL_SCOPE
+        kind, _ = SETTINGS[key]
+        self.for_guild(guild_id)[key] = value
+        self._dirty[(guild_id, key)] = json.dumps(_KINDS[kind][1](value))
+        logger.debug(f"Set {key} for guild {guild_id} (pending write)")
+
+    def reset(self, guild_id, key):
+        """Put a setting back to its default value"""
+        if guild_id is None:
+            guild_id = GLOBAL_SCOPE
+        _, default = SETTINGS[key]
+        self.for_guild(guild_id)[key] = default
+        self._dirty[(guild_id, key)] = None
+        logger.debug(f"Reset {key} for guild {guild_id} (pending write)")
+
+    def seed(self, guild_id, key, value):
+        """Set a setting only if the guild has never stored a value for it"""
+        if guild_id is None:
+            guild_id = GLOBAL_SCOPE
+        row = self._db.execute(
+            "SELECT 1 FROM guild_config WHERE guild_id = ? AND key = ?", (guild_id, key)
+        ).fetchone()
+        if row is None and (guild_id, key) not in self._dirty:
+            self.set(guild_id, key, value)
+            logger.info(f"Seeded {key} for guild {guild_id}")
+
+    def parse(self, key, text):
+        """Turn command text into a value for a setting. Raises ValueError on bad input."""
+        kind, _ = SETTINGS[key]
+        try:
+            return _KINDS[kind][0](text)
+        except pytz.UnknownTimeZoneError:
+            raise ValueError(f"Unknown timezone: {text}")
+
+    def show(self, key, value):
+        """Format a setting value for display"""
+        kind, _ = SETTINGS[key]
+        return _KINDS[kind][3](value)
+
+    def _load_guild(self, guild_id):
+        """Read a guild's settings from SQLite into the cache (cache miss path)"""
+        settings = {key: default for key, (_, default) in SETTINGS.items()}
+        rows = self._db.execute(
+            "SELECT key, value FROM guild_config WHERE guild_id = ?", (guild_id,)
+        ).fetchall()
+        for key, value in rows:
+            if key not in SETTINGS:
+                logger.warning(f"Ignoring unknown setting {key} for guild {guild_id}")
+                continue
+            kind, _ = SETTINGS[key]
+            try:
+                settings[key] = _KINDS[kind][2](json.loads(value))
+            except Exception as e:
+                logger.error(f"Bad stored value for {key} in guild {guild_id}: {e}")
+        self._cache[guild_id] = settings
+        logger.debug(f"Loaded {len(rows)} stored settings for guild {guild_id}")
+        return settings
+
+    def flush(self):
+        """Write all pending changes to SQLite in one transaction"""
+        if not self._dirty:
+            return 0
+        pending, self._dirty = self._dirty, {}
+        upserts = [(gid, key, value) for (gid, key), value in pending.items() if value is not None]
+        deletes = [(gid, key) for (gid, key), value in pending.items() if value is None]
+        try:
+            with self._db:
+                if upserts:
+                    self._db.executemany(
+                        "INSERT INTO guild_config (guild_id, key, value) VALUES (?, ?, ?) "
+                        "ON CONFLICT (guild_id, key) DO UPDATE SET value = excluded.value",
+                        upserts,
+                    )
+                if deletes:
+                    self._db.executemany(
+                        "DELETE FROM guild_config WHERE guild_id = ? AND key = ?", deletes
+                    )
+        except Exception as e:
+            logger.error(f"Failed to flush guild config: {e}", exc_info=True)
+            # Keep the changes around for the next flush, newer edits win
+            pending.update(self._dirty)
+            self._dirty = pending
+            return 0
+        logger.debug(f"Flushed {len(pending)} guild config changes")
+        return len(pending)
+
+    async def start(self):
+        """Start the write-behind flush task - MUST be called from an async context"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._flush_loop())
+
+    async def _flush_loop(self):
+        """Periodically write pending changes to disk"""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            self.flush()
+
+    def close(self):
+        """Stop the flush task, write what is left and close the database"""
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        self.flush()
+        self._db.close()
+        logger.info("GuildConfig closed")
+
+
+def setup(bot):
+    """Create the guild config store and register the config commands"""
+    path = os.getenv('BEANBOT_CONFIG_DB', 'beanbot_config.db')
+    guild_config = GuildConfig(path)
+
+    # Carry the dog reminder users over from .env the first time a guild is set up
+    seed_guild_id = os.getenv('DOG_REMINDER_GUILD_ID')
+    if seed_guild_id:
+        for key, env_name in (("dog_reminder_user_id", 'DOG_REMINDER_USER_ID'),
+                              ("dog_owner_id", 'DOG_OWNER_ID')):
+            value = os.getenv(env_name)
+            if value:
+                guild_config.seed(int(seed_guild_id), key, int(value))
+        guild_config.flush()
+    else:
+        logger.warning("DOG_REMINDER_GUILD_ID is not set; dog reminders are off until !setdogreminder is used in a server")
+
+    # Add a modified on_ready handler to start the flush task
+    original_on_ready = bot.event(bot.on_ready)
+
+    @bot.event
+    async def on_ready():
+        # Call the original on_ready if it exists
+        if original_on_ready:
+            await original_on_ready()
+
+        await guild_config.start()
+        logger.info("Guild config flush task started from on_ready event")
+
+    @bot.group(name="config", invoke_without_command=True)
+    @commands.is_owner()  # Only the bot owner can use this command
+    async def config(ctx, key: str = None):
+        """Show the settings for this server (or the DM settings when used in a DM)"""
+        settings = guild_config.for_guild(ctx.guild.id if ctx.guild else None)
+        keys = [key] if key else list(SETTINGS)
+        if key and key not in SETTINGS:
+            await ctx.send(f"Unknown setting: {key}")
+            return
+        scope = ctx.guild.name if ctx.guild else "DMs"
+        lines = [f"⚙️ Settings for {scope} ⚙️"]
+        for name in keys:
+            lines.append(f"{name}: {guild_config.show(name, settings[name])}")
+        await ctx.send("\n".join(lines))
+
+    @config.command(name="set")
+    @commands.is_owner()  # Only the bot owner can use this command
+    async def config_set(ctx, key: str, *, value: str):
+        """Change a setting for this server"""
+        if key not in SETTINGS:
+            await ctx.send(f"Unknown setting: {key}")
+            return
+        try:
+            parsed = guild_config.parse(key, value)
+        except ValueError as e:
+            await ctx.send(f"Invalid value for {key}: {e}")
+            return
+        guild_config.set(ctx.guild.id if ctx.guild else None, key, parsed)
+        await ctx.send(f"{key} set to {guild_config.show(key, parsed)}")
+        logger.info(f"{ctx.author} set {key} for {ctx.guild or 'DMs'}")
+
+    @config.command(name="reset")
+    @commands.is_owner()  # Only the bot owner can use this command
+    async def config_reset(ctx, key: str):
+        """Put a setting for this server back to its default"""
+        if key not in SETTINGS:
+            await ctx.send(f"Unknown setting: {key}")
+            return
+        guild_config.reset(ctx.guild.id if ctx.guild else None, key)
+        await ctx.send(f"{key} reset to {guild_config.show(key, SETTINGS[key][1])}")
+        logger.info(f"{ctx.author} reset {key} for {ctx.guild or 'DMs'}")
+
+    @bot.group(name="whatami", invoke_without_command=True)
+    @commands.is_owner()  # Only the bot owner can use this command
+    async def what_am_i(ctx):
+        """Show the "what am I" responses for this server"""
+        settings = guild_config.for_guild(ctx.guild.id if ctx.guild else None)
+        await ctx.send(f"Default: {settings['what_am_i_default']}\n"
+                       f"Per user:\n{guild_config.show('what_am_i_responses', settings['what_am_i_responses'])}")
+
+    @what_am_i.command(name="set")
+    @commands.is_owner()  # Only the bot owner can use this command
+    async def what_am_i_set(ctx, user: discord.User, *, response: str):
+        """Set the "what am I" response for a user. Use {mention} to mention them."""
+        guild_id = ctx.guild.id if ctx.guild else None
+        responses = dict(guild_config.get(guild_id, "what_am_i_responses"))
+        responses[user.id] = response
+        guild_config.set(guild_id, "what_am_i_responses", responses)
+        await ctx.send(f"Response for {user.name} set.")
+
+    @what_am_i.command(name="clear")
+    @commands.is_owner()  # Only the bot owner can use this command
+    async def what_am_i_clear(ctx, user: discord.User):
+        """Remove the "what am I" response for a user"""
+        guild_id = ctx.guild.id if ctx.guild else None
+        responses = dict(guild_config.get(guild_id, "what_am_i_responses"))
+        if responses.pop(user.id, None) is None:
+            await ctx.send(f"{user.name} has no custom response.")
+            return
+        guild_config.set(guild_id, "what_am_i_responses", responses)
+        await ctx.send(f"Response for {user.name} removed.")
+
+    return guild_config
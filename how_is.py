@@ -7,7 +7,21 @@ import discord
 from discord.ext import commands
 import random
 import aiohttp
+import asyncio
 import json
+import re
+import time
+
+# How many DMs the bulk sender works on at once
+JOKE_WORKERS = 5
+# Minimum time between two DMs, shared by all workers, to stay under Discord's DM rate limits
+DM_SEND_INTERVAL = 0.25
+# How many different jokes to fetch for one bulk send
+JOKE_POOL_SIZE = 10
+# How often the progress message is updated (seconds)
+PROGRESS_INTERVAL = 2
+# How many users or targets to list in one message, to stay under Discord's length limit
+MAX_LISTED = 20
 
 class HowIsJoke:
     def __init__(self, bot):
@@ -26,45 +40,68 @@ class HowIsJoke:
         ]
         # We'll keep this list as a fallback, but we'll also try to fetch jokes from an API
 
-    async def get_joke_from_api(self):
-        """Fetch a dad joke from icanhazdadjoke API"""
+    async def get_joke_from_api(self, session=None):
+        """Fetch a dad joke from icanhazdadjoke API, reusing the given session if there is one"""
         try:
             headers = {
                 "Accept": "application/json",
                 "User-Agent": "BeanBot Dad Jokes Module (Discord Bot)"
             }
-            async with aiohttp.ClientSession() as session:
-                async with session.get("https://icanhazdadjoke.com/", headers=headers) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return data.get("joke", None)
+            if session is None:
+                async with aiohttp.ClientSession() as session:
+                    return await self._request_joke(session, headers)
+            return await self._request_joke(session, headers)
         except Exception as e:
             print(f"Failed to fetch joke from API: {e}")
         
         return None
 
-    async def send_dad_joke(self, user_id):
+    async def _request_joke(self, session, headers):
+        async with session.get("https://icanhazdadjoke.com/", headers=headers) as response:
+            if response.status == 200:
+                data = await response.json()
+                return data.get("joke", None)
+        return None
+
+    async def get_jokes(self, count):
+        """Fetch up to count different jokes at once over one session, topped up from the backup list"""
+        async with aiohttp.ClientSession() as session:
+            jokes = await asyncio.gather(*(self.get_joke_from_api(session) for _ in range(count)))
+        # The API can return the same joke twice, keep each one once
+        jokes = list(dict.fromkeys(joke for joke in jokes if joke))
+        if not jokes:
+            jokes = random.sample(self.dad_jokes, min(count, len(self.dad_jokes)))
+        return jokes
+
+    def joke_embed(self, joke):
+        """Create a nice embed for a joke"""
+        embed = discord.Embed(
+            title="Dad Joke Time!",
+            description="Hey there, it seems like you didn't read Lazzy's bio. We don't ask 'how are you'-questions in this house. Here's a dad joke instead:\n\n" + joke,
+            color=0x00FF00
+        )
+        embed.set_footer(text="Sent with ❤️ by BeanBot")
+        return embed
+
+    async def get_user(self, user_id):
+        """Get a user from the bot's cache, only asking the API if it isn't there"""
+        return self.bot.get_user(user_id) or await self.bot.fetch_user(user_id)
+
+    async def send_dad_joke(self, user_id, joke=None):
         """Send a dad joke to a specific user"""
         try:
-            user = await self.bot.fetch_user(user_id)
+            user = await self.get_user(user_id)
             
             # Try to get a joke from the API first
-            joke = await self.get_joke_from_api()
+            if not joke:
+                joke = await self.get_joke_from_api()
             
             # If API fails, use our backup list
             if not joke:
                 joke = random.choice(self.dad_jokes)
-                
-            # Create a nice embed for the joke
-            embed = discord.Embed(
-                title="Dad Joke Time!",
-                description="Hey there, it seems like you didn't read Lazzy's bio. We don't ask 'how are you'-questions in this house. Here's a dad joke instead:\n\n" + joke,
-                color=0x00FF00
-            )
-            embed.set_footer(text="Sent with ❤️ by BeanBot")
             
             # Send the joke
-            await user.send(embed=embed)
+            await user.send(embed=self.joke_embed(joke))
             print(f"Sent dad joke to user {user.name}")
             return True
             
@@ -72,19 +109,144 @@ class HowIsJoke:
             print(f"Failed to send dad joke: {e}")
             return False
 
+    async def send_dad_jokes(self, user_ids, progress=None):
+        """Send dad jokes to many users through a small pool of workers.
+
+        progress, if given, is awaited with the results so far after each user.
+        Returns a dict with the sent user ids, failures by reason and the elapsed time.
+        """
+        start = time.perf_counter()
+        results = {"sent": [], "failed": {}, "total": len(user_ids)}
+        jokes = await self.get_jokes(min(len(user_ids), JOKE_POOL_SIZE))
+        queue = asyncio.Queue()
+        for i, user_id in enumerate(user_ids):
+            queue.put_nowait((user_id, jokes[i % len(jokes)]))
+        send_lock = asyncio.Lock()
+        last_send = 0.0
+
+        async def worker():
+            nonlocal last_send
+            while True:
+                try:
+                    user_id, joke = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                try:
+                    user = await self.get_user(user_id)
+                    # Space out DMs across all workers
+                    async with send_lock:
+                        wait = last_send + DM_SEND_INTERVAL - time.perf_counter()
+                        if wait > 0:
+                            await asyncio.sleep(wait)
+                        last_send = time.perf_counter()
+                    await user.send(embed=self.joke_embed(joke))
+                    results["sent"].append(user_id)
+                except discord.NotFound:
+                    results["failed"].setdefault("user not found", []).append(user_id)
+                except discord.Forbidden:
+                    results["failed"].setdefault("DMs closed", []).append(user_id)
+                except Exception as e:
+                    print(f"Failed to send dad joke to {user_id}: {e}")
+                    results["failed"].setdefault("other error", []).append(user_id)
+                if progress:
+                    await progress(results)
+
+        await asyncio.gather(*(worker() for _ in range(min(JOKE_WORKERS, len(user_ids)))))
+        results["elapsed"] = time.perf_counter() - start
+        print(f"Sent {len(results['sent'])}/{len(user_ids)} dad jokes in {results['elapsed']:.1f}s")
+        return results
+
+    async def resolve_targets(self, ctx, targets):
+        """Turn role/user mentions, IDs and role names into a list of unique user IDs.
+
+        Returns the user IDs, the targets that could not be resolved and the roles that were used.
+        The @everyone role is never expanded and counts as unresolved.
+        """
+        user_ids = []
+        unresolved = []
+        roles = []
+        for target in (part.strip() for arg in targets for part in arg.split(",")):
+            if not target:
+                continue
+            if ctx.guild:
+                try:
+                    role = await commands.RoleConverter().convert(ctx, target)
+                    if role.is_default():
+                        # Never DM the whole server
+                        unresolved.append(f"{target} (not allowed)")
+                    else:
+                        roles.append(role)
+                        user_ids.extend(member.id for member in role.members if not member.bot)
+                    continue
+                except commands.BadArgument:
+                    pass
+            match = re.fullmatch(r"<@!?(\d+)>|(\d+)", target)
+            if match:
+                user_ids.append(int(match.group(1) or match.group(2)))
+            else:
+                unresolved.append(target)
+        # Each user gets one joke even if they were named twice or are in two roles
+        return list(dict.fromkeys(user_ids)), unresolved, roles
+
+    async def can_send_bulk(self, ctx):
+        """Only the bot owner or server managers may send jokes to roles or several users"""
+        if await self.bot.is_owner(ctx.author):
+            return True
+        return ctx.guild is not None and ctx.author.guild_permissions.manage_guild
+
 def setup(bot):
     """Create and register the dad joke commands"""
     how_is_joke = HowIsJoke(bot)
     
     @bot.command(name="sendjoke")
-    async def send_joke(ctx, user_id: int = None):
-        """Send a dad joke to a specified user or to the command invoker if no user specified"""
-        if not user_id:
-            user_id = ctx.author.id
-            
-        success = await how_is_joke.send_dad_joke(user_id)
-        
-        if success:
-            await ctx.send(f"Dad joke sent successfully! 😄")
+    async def send_joke(ctx, *targets: str):
+        """Send a dad joke to yourself or one user. Owners and server managers can also
+        send to roles or several users/IDs (space or comma separated)."""
+        if targets:
+            user_ids, unresolved, roles = await how_is_joke.resolve_targets(ctx, targets)
         else:
-            await ctx.send(f"Failed to send dad joke. Check logs for details.")
+            user_ids, unresolved, roles = [ctx.author.id], [], []
+        
+        # Sending to a role or to several people at once can spam a server, so it is restricted
+        if (roles or len(user_ids) > 1) and not await how_is_joke.can_send_bulk(ctx):
+            await ctx.send("Only the bot owner or people who can manage this server can send jokes to roles or several users.")
+            return
+        
+        if unresolved:
+            # Echo what was typed without pinging anyone (e.g. "@everyone", "@here")
+            not_found = ", ".join(target[:50] for target in unresolved[:MAX_LISTED])
+            if len(unresolved) > MAX_LISTED:
+                not_found += f" and {len(unresolved) - MAX_LISTED} more"
+            await ctx.send(f"Could not find: {not_found}", allowed_mentions=discord.AllowedMentions.none())
+        if not user_ids:
+            await ctx.send("No users to send a dad joke to.")
+            return
+        
+        status = await ctx.send(f"Sending dad jokes... 0/{len(user_ids)}")
+        last_update = time.perf_counter()
+        
+        async def progress(results):
+            nonlocal last_update
+            # Edit the status message every few seconds instead of once per user
+            now = time.perf_counter()
+            if now - last_update < PROGRESS_INTERVAL:
+                return
+            last_update = now
+            done = len(results["sent"]) + sum(len(ids) for ids in results["failed"].values())
+            try:
+                await status.edit(content=f"Sending dad jokes... {done}/{results['total']}")
+            except Exception as e:
+                print(f"Failed to update joke progress: {e}")
+        
+        results = await how_is_joke.send_dad_jokes(user_ids, progress)
+        
+        failed_count = sum(len(ids) for ids in results["failed"].values())
+        summary = (f"Dad jokes sent: {len(results['sent'])}/{results['total']} "
+                   f"({failed_count} failed) in {results['elapsed']:.1f}s"
+                   + (" 😄" if not failed_count else ""))
+        for reason, ids in results["failed"].items():
+            # Keep the message under Discord's length limit for big sends
+            summary += f"\n- {reason} ({len(ids)}): " + ", ".join(f"<@{user_id}>" for user_id in ids[:MAX_LISTED])
+            if len(ids) > MAX_LISTED:
+                summary += f" and {len(ids) - MAX_LISTED} more"
+        await status.edit(content=summary, allowed_mentions=discord.AllowedMentions.none())
@@ -10,6 +10,8 @@ from dotenv import load_dotenv
 # Local modules
 import dog_reminder
 import how_is
+import guild_config
+import profiler
 
 # Load environment variables from .env file
 load_dotenv()
@@ -54,8 +56,8 @@ async def on_message(message):
         return
 
     msg_content = message.content.lower()
-    how_are_phrases = ["how are you", "how is", "hows it going", "how's it going", "how are"]
-    employer_phrases = ["employer", "regiocom", "workplace", "coworkers"]
+    # Per-guild settings (trigger phrases, "what am I" responses) come from the cache
+    settings = guild_config_store.for_guild(message.guild.id if message.guild else None)
 
     # Log some information about the message context
     print(f"Message is in guild: {message.guild}, channel: {message.channel}")
@@ -65,16 +67,8 @@ async def on_message(message):
     # Check if specific phrases are contained anywhere in the message
     
     if "what am i" in msg_content:
-        if message.author.id == 143474592529252353:
-            await message.channel.send(f'You are the dumbest of all nerds, {message.author.mention}!')
-        elif message.author.id == 343513966049492999:
-            await message.channel.send(f'Youre a bottom cow, {message.author.mention}!')
-        elif message.author.id == 287897806751006720:
-            await message.channel.send(f'Youre a bimbdeer pretending to be a smart doctor.. who is also actually a smart doctor, {message.author.mention}!')
-        elif message.author.id == 690988264697364532:
-            await message.channel.send(f'Youre a lil piss baby, {message.author.mention}!')
-        else:
-            await message.channel.send(f'You are a bottom, {message.author.mention}!')
+        response = settings["what_am_i_responses"].get(message.author.id, settings["what_am_i_default"])
+        await message.channel.send(response.replace("{mention}", message.author.mention))
     
     if "i love" in msg_content:
         await message.channel.send(f'I love you too, {message.author.mention}! <3')
@@ -92,7 +86,7 @@ async def on_message(message):
         response = " ".join(["weh"] * weh_count)
         await message.channel.send(response)
 
-    if any(phrase in msg_content for phrase in employer_phrases):
+    if any(phrase in msg_content for phrase in settings["employer_phrases"]):
         await message.channel.send('Screw those guys.')
 
     if "left" in msg_content:
@@ -147,7 +141,7 @@ async def on_message(message):
 
  # Check if the message contains any of the target phrases
         
-    if any(phrase in msg_content for phrase in how_are_phrases):
+    if any(phrase in msg_content for phrase in settings["how_are_phrases"]):
         # Try to get a joke from the API first
         joke = await how_is_joke.get_joke_from_api()
         
@@ -167,8 +161,10 @@ async def on_message(message):
 token = os.getenv('DISCORD_TOKEN')
 
 # Initialize modules
-dog_reminder_instance = dog_reminder.setup(bot)
+guild_config_store = guild_config.setup(bot)
+dog_reminder_instance = dog_reminder.setup(bot, guild_config_store)
 how_is_instance = how_is.setup(bot)
+profiler.setup(bot)
 
 # Create an instance of HowIsJoke for use in message handler
 from how_is import HowIsJoke
@@ -220,4 +216,7 @@ except Exception as e:
         import traceback
         f.write(f"Error occurred at {datetime.datetime.now()}: {str(e)}\n")
         f.write(traceback.format_exc())
-        f.write("\n---\n")
\ No newline at end of file
+        f.write("\n---\n")
+finally:
+    # Write any pending config changes before exiting
+    guild_config_store.close()
\ No newline at end of file
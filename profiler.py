@@ -0,0 +1,294 @@
+"""
+Profiler module for BeanBot.
+This module provides an on-demand sampling profiler for the running bot.
+Nothing is installed or running unless a profile has been requested.
+
+Samples are taken by a SIGALRM timer, so the handler runs on the event loop thread
+itself between bytecodes. Short busy callbacks get sampled as often as idle time,
+which a separate sampler thread (waiting for the GIL) cannot do. The timer is re-armed
+with some jitter each time so it doesn't lock onto the loop's own wake-ups.
+"""
+
+import discord
+from discord.ext import commands
+import asyncio
+import collections
+import datetime
+import functools
+import io
+import linecache
+import os
+import random
+import signal
+import threading
+import time
+import weakref
+
+MAX_PROFILE_SECONDS = 300
+TOP_N = 25
+
+
+# Stacks are tuples of (code, line) pairs, outermost call first. The line is only kept
+# for main.py's on_message, so samples there can be told apart by trigger.
+
+def _is_on_message(code):
+    return code.co_name == "on_message" and os.path.basename(code.co_filename) == "main.py"
+
+
+def _frame_label(entry):
+    """Short name for a stack entry, e.g. how_is.py:HowIsJoke.get_joke_from_api"""
+    code, line = entry
+    label = f"{os.path.basename(code.co_filename)}:{getattr(code, 'co_qualname', code.co_name)}"
+    return f"{label}:{line}" if line else label
+
+
+def _thread_stack(frame):
+    """Stack entries of a thread's stack, outermost call first"""
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        stack.append((code, frame.f_lineno if _is_on_message(code) else None))
+        frame = frame.f_back
+    stack.reverse()
+    return stack
+
+
+def _task_stack(task):
+    """Stack entries of the coroutine chain a task is suspended in, outermost first"""
+    stack = []
+    coro = task.get_coro()
+    while coro is not None:
+        code = getattr(coro, "cr_code", None) or getattr(coro, "gi_code", None)
+        if code is None:
+            break
+        line = None
+        if _is_on_message(code):
+            frame = getattr(coro, "cr_frame", None)
+            line = frame.f_lineno if frame is not None else None
+        stack.append((code, line))
+        coro = getattr(coro, "cr_await", None) or getattr(coro, "gi_yieldfrom", None)
+    return stack
+
+
+@functools.lru_cache(maxsize=None)
+def _on_message_trigger(code, line):
+    """Name the on_message trigger a line belongs to, e.g. 'on_message: if "based" in msg_content'"""
+    lines = linecache.getlines(code.co_filename)
+    # co_firstlineno points at the decorator, so find the def line to get the body's indent
+    first = code.co_firstlineno - 1
+    while first < len(lines) and not lines[first].lstrip().startswith(("def ", "async def ")):
+        first += 1
+    if line is None or first >= len(lines):
+        return "on_message"
+    if line <= first + 1:
+        # A task that hasn't started running yet sits on the def line
+        return "on_message (starting)"
+    body_indent = len(lines[first]) - len(lines[first].lstrip()) + 4
+    # Walk back to the top-level statement of the function body this line is part of
+    for i in range(min(line, len(lines)) - 1, first, -1):
+        text = lines[i].strip()
+        if not text or text.startswith("#"):
+            continue
+        indent = len(lines[i]) - len(lines[i].lstrip())
+        if indent <= body_indent:
+            if text.startswith("if "):
+                return f"on_message: {text.rstrip(':')}"
+            break
+    return f"on_message (line {line})"
+
+
+def categorize(stack):
+    """Attribute a stack to the part of the bot that is responsible for it"""
+    command = None
+    on_message = None
+    for i, (code, line) in enumerate(stack):
+        filename = os.path.basename(code.co_filename)
+        qualname = getattr(code, "co_qualname", code.co_name)
+        if filename == "how_is.py" and qualname.startswith("HowIsJoke."):
+            return f"HowIsJoke ({code.co_name})"
+        if filename == "dog_reminder.py" and qualname.startswith("DogReminder"):
+            return "DogReminder"
+        if filename == "guild_config.py" and qualname.startswith("GuildConfig"):
+            return "GuildConfig"
+        # Command callbacks are called from the wrapper in discord/ext/commands/core.py
+        if (command is None and code.co_name == "wrapped" and i + 1 < len(stack)
+                and code.co_filename.endswith(os.path.join("commands", "core.py"))):
+            command = stack[i + 1][0].co_name
+        if on_message is None and _is_on_message(code):
+            on_message = _on_message_trigger(code, line)
+    if command:
+        return f"command ({command})"
+    if on_message:
+        return on_message
+    if stack and os.path.basename(stack[-1][0].co_filename) == "selectors.py":
+        return "idle"
+    return "other"
+
+
+class SamplingProfiler:
+    def __init__(self, interval=0.01):
+        self.interval = interval  # Seconds between samples
+        self.cpu_samples = collections.Counter()  # Stacks running on the event loop thread
+        self.wait_samples = collections.Counter()  # Stacks of tasks started during the profile
+        self.background_samples = collections.Counter()  # Stacks of tasks that were already running
+        self.sample_count = 0
+        self.elapsed = 0
+        self._loop = None
+        self._start_time = None
+        self._previous_handler = None
+        self._running = False
+        self._own_task = None
+        self._background_tasks = weakref.WeakSet()
+
+    @staticmethod
+    def available():
+        """Signal handlers can only be installed from the main thread, where bot.run() runs the loop"""
+        return hasattr(signal, "setitimer") and threading.current_thread() is threading.main_thread()
+
+    def start(self):
+        """Start sampling the event loop - MUST be called from the event loop on the main thread"""
+        if not self.available():
+            raise RuntimeError("The profiler needs the event loop to run on the main thread")
+        self._loop = asyncio.get_running_loop()
+        # The task running the profile only ever waits on its own sleep, so leave it out.
+        # Long-lived tasks (gateway, reminder loop, config flush) would dominate the
+        # percentages for work started during the profile, so they get their own section.
+        self._own_task = asyncio.current_task()
+        self._background_tasks = weakref.WeakSet(asyncio.all_tasks(self._loop))
+        self._previous_handler = signal.signal(signal.SIGALRM, self._on_signal)
+        self._start_time = time.perf_counter()
+        self._running = True
+        self._arm()
+
+    def stop(self):
+        """Stop the timer and put the previous SIGALRM handler back"""
+        if self._start_time is None:
+            return
+        self._running = False
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, self._previous_handler or signal.SIG_DFL)
+        self.elapsed = time.perf_counter() - self._start_time
+        self._start_time = None
+
+    def _arm(self):
+        # A fixed period aliases with callbacks that run on a regular beat, so vary it
+        signal.setitimer(signal.ITIMER_REAL, self.interval * random.uniform(0.5, 1.5))
+
+    def _on_signal(self, signum, frame):
+        if not self._running:
+            return
+        self._arm()
+        # frame is whatever the loop thread was running when the timer fired;
+        # when the loop is idle that is the selector's select()
+        if frame is not None:
+            self.cpu_samples[tuple(_thread_stack(frame))] += 1
+        try:
+            tasks = asyncio.all_tasks(self._loop)
+        except RuntimeError:
+            # The task set changed while we were reading it, skip this round
+            tasks = ()
+        for task in tasks:
+            if task is self._own_task:
+                continue
+            stack = _task_stack(task)
+            if not stack:
+                continue
+            if task in self._background_tasks:
+                self.background_samples[tuple(stack)] += 1
+            else:
+                self.wait_samples[tuple(stack)] += 1
+        self.sample_count += 1
+
+    def collapsed(self):
+        """Samples in collapsed-stack format (one "a;b;c count" line per stack), for flame graphs"""
+        lines = []
+        kinds = (("cpu", self.cpu_samples), ("wait", self.wait_samples),
+                 ("background", self.background_samples))
+        for kind, samples in kinds:
+            for stack, count in samples.most_common():
+                frames = [kind, categorize(stack)] + [_frame_label(entry) for entry in stack]
+                lines.append(f"{';'.join(frames)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def report(self, top=TOP_N):
+        """Human readable top-N report"""
+        lines = [
+            f"BeanBot profile taken {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+            f"Duration: {self.elapsed:.1f}s, {self.sample_count} samples every {self.interval * 1000:.0f}ms",
+        ]
+        sections = (
+            ("Event loop thread (share of wall-clock time, idle = waiting for events)", self.cpu_samples),
+            ("Tasks started during the profile (time spent waiting in an await)", self.wait_samples),
+        )
+        for title, samples in sections:
+            total = sum(samples.values()) or 1
+            by_category = collections.Counter()
+            by_function = collections.Counter()
+            for stack, count in samples.items():
+                by_category[categorize(stack)] += count
+                by_function[_frame_label(stack[-1])] += count
+            lines.append("")
+            lines.append(f"== {title} ==")
+            lines.append("By source:")
+            for name, count in by_category.most_common(top):
+                lines.append(f"  {100 * count / total:5.1f}%  {count:6d}  {name}")
+            lines.append(f"Top {top} innermost functions:")
+            for name, count in by_function.most_common(top):
+                lines.append(f"  {100 * count / total:5.1f}%  {count:6d}  {name}")
+
+        # Background loops sleep almost all the time, so only show where each one was waiting
+        by_task = collections.defaultdict(collections.Counter)
+        for stack, count in self.background_samples.items():
+            by_task[_frame_label(stack[0])][_frame_label(stack[-1])] += count
+        lines.append("")
+        lines.append("== Background tasks already running when the profile started ==")
+        for task_name, waits in sorted(by_task.items()):
+            total = sum(waits.values()) or 1
+            where = ", ".join(f"{name} {100 * count / total:.0f}%" for name, count in waits.most_common(3))
+            lines.append(f"  {task_name}: {where}")
+        return "\n".join(lines) + "\n"
+
+
+def setup(bot):
+    """Register the profile command"""
+    running = {"profiler": None}
+
+    @bot.command(name="profile")
+    @commands.is_owner()  # Only the bot owner can use this command
+    async def profile(ctx, seconds: int = 10):
+        """Profile the running bot for a number of seconds and DM the report"""
+        if not (1 <= seconds <= MAX_PROFILE_SECONDS):
+            await ctx.send(f"Seconds must be between 1 and {MAX_PROFILE_SECONDS}.")
+            return
+        if running["profiler"] is not None:
+            await ctx.send("A profile is already running.")
+            return
+        if not SamplingProfiler.available():
+            await ctx.send("Profiling only works when the bot's event loop runs on the main thread.")
+            return
+
+        profiler = SamplingProfiler()
+        running["profiler"] = profiler
+        await ctx.send(f"Profiling for {seconds} seconds...")
+        print(f"Profile started by {ctx.author} for {seconds} seconds")
+        try:
+            profiler.start()
+            await asyncio.sleep(seconds)
+        except RuntimeError as e:
+            await ctx.send(f"Could not start the profiler: {e}")
+            return
+        finally:
+            profiler.stop()
+            running["profiler"] = None
+
+        report = profiler.report()
+        files = [
+            discord.File(io.BytesIO(report.encode("utf-8")), filename="profile_top.txt"),
+            discord.File(io.BytesIO(profiler.collapsed().encode("utf-8")), filename="profile_collapsed.txt"),
+        ]
+        try:
+            await ctx.author.send(f"Profile finished ({profiler.sample_count} samples).", files=files)
+            await ctx.send("Profile finished, report sent by DM.")
+        except Exception as e:
+            print(f"Failed to send profile report: {e}")
+            await ctx.send(f"Profile finished but the report could not be sent: {e}")